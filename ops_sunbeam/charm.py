@@ -31,22 +31,19 @@ containers and managing the service running in the container.
 
 import ipaddress
 import logging
+from functools import (
+    cached_property,
+)
 from typing import (
+    TYPE_CHECKING,
     List,
     Mapping,
 )
 
-import charms.observability_libs.v0.kubernetes_service_patch as kube_svc_patch
 import ops.charm
 import ops.framework
 import ops.model
 import ops.pebble
-from lightkube import (
-    Client,
-)
-from lightkube.resources.core_v1 import (
-    Service,
-)
 from ops.model import (
     ActiveStatus,
     MaintenanceStatus,
@@ -58,6 +55,9 @@ import ops_sunbeam.container_handlers as sunbeam_chandlers
 import ops_sunbeam.core as sunbeam_core
 import ops_sunbeam.relation_handlers as sunbeam_rhandlers
 
+if TYPE_CHECKING:
+    import lightkube
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,7 +67,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
     _state = ops.framework.StoredState()
 
     # Holds set of mandatory relations
-    mandatory_relations = set()
+    mandatory_relations = frozenset()
 
     def __init__(self, framework: ops.framework.Framework) -> None:
         """Run constructor."""
@@ -87,6 +87,14 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
             )
         self.relation_handlers = self.get_relation_handlers()
         self.pebble_handlers = self.get_pebble_handlers()
+        self._pebble_handlers_by_container = {}
+        for ph in self.pebble_handlers:
+            if ph.container_name in self._pebble_handlers_by_container:
+                raise ValueError(
+                    "Multiple pebble handlers for container "
+                    f"{ph.container_name}"
+                )
+            self._pebble_handlers_by_container[ph.container_name] = ph
         self.framework.observe(self.on.config_changed, self._on_config_changed)
 
     def can_add_handler(
@@ -95,16 +103,17 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         handlers: List[sunbeam_rhandlers.RelationHandler],
     ) -> bool:
         """Whether a handler for the given relation can be added."""
-        if relation_name not in self.meta.relations.keys():
-            logging.debug(
-                f"Cannot add handler for relation {relation_name}, relation "
-                "not present in charm metadata"
+        if relation_name not in self.meta.relations:
+            logger.debug(
+                "Cannot add handler for relation %s, relation not present "
+                "in charm metadata",
+                relation_name,
             )
             return False
-        if relation_name in [h.relation_name for h in handlers]:
-            logging.debug(
-                f"Cannot add handler for relation {relation_name}, handler "
-                "already present"
+        if any(h.relation_name == relation_name for h in handlers):
+            logger.debug(
+                "Cannot add handler for relation %s, handler already present",
+                relation_name,
             )
             return False
         return True
@@ -162,13 +171,15 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
 
     def get_sans(self) -> List[str]:
         """Return Subject Alternate Names to use in cert for service."""
-        str_ips_sans = [str(s) for s in self.get_ip_sans()]
-        return list(set(str_ips_sans + self.get_domain_name_sans()))
+        # Bindings without an address report None, which must not end up
+        # in the certificate as the string "None".
+        str_ips_sans = [str(s) for s in self.get_ip_sans() if s is not None]
+        return list(dict.fromkeys(str_ips_sans + self.get_domain_name_sans()))
 
     def get_ip_sans(self) -> List[ipaddress.IPv4Address]:
         """Get IP addresses for service."""
         ip_sans = []
-        for relation_name in self.meta.relations.keys():
+        for relation_name in self.meta.relations:
             for relation in self.framework.model.relations.get(
                 relation_name, []
             ):
@@ -182,7 +193,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
                 ip_sans.append(binding.network.ingress_address)
                 ip_sans.append(binding.network.bind_address)
             except ops.model.ModelError:
-                logging.debug(f"No binding found for {binding_name}")
+                logger.debug("No binding found for %s", binding_name)
         return ip_sans
 
     def get_domain_name_sans(self) -> List[str]:
@@ -211,23 +222,13 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         self, container_name: str
     ) -> sunbeam_chandlers.PebbleHandler:
         """Get pebble handler matching container_name."""
-        pebble_handlers = [
-            h
-            for h in self.pebble_handlers
-            if h.container_name == container_name
-        ]
-        assert len(pebble_handlers) < 2, (
-            "Multiple pebble handlers with the " "same name found."
-        )
-        if pebble_handlers:
-            return pebble_handlers[0]
-        else:
-            return None
+        return self._pebble_handlers_by_container.get(container_name)
 
     def get_named_pebble_handlers(
         self, container_names: List[str]
     ) -> List[sunbeam_chandlers.PebbleHandler]:
         """Get pebble handlers matching container_names."""
+        container_names = set(container_names)
         return [
             h
             for h in self.pebble_handlers
@@ -240,34 +241,39 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         if self.supports_peer_relation and not (
             self.unit.is_leader() or self.is_leader_ready()
         ):
-            logging.debug("Leader not ready")
+            logger.debug("Leader not ready")
             return
 
         if not self.relation_handlers_ready():
-            logging.debug("Aborting charm relations not ready")
+            logger.debug("Aborting charm relations not ready")
             return
 
+        # The contexts only depend on relation data and config, so build
+        # them once and share them between the pebble handlers.
+        contexts = None
         for ph in self.pebble_handlers:
             if ph.pebble_ready:
-                logging.debug(f"Running init for {ph.service_name}")
-                ph.init_service(self.contexts())
+                logger.debug("Running init for %s", ph.service_name)
+                if contexts is None:
+                    contexts = self.contexts()
+                ph.init_service(contexts)
             else:
-                logging.debug(
-                    f"Not running init for {ph.service_name},"
-                    " container not ready"
+                logger.debug(
+                    "Not running init for %s, container not ready",
+                    ph.service_name,
                 )
 
         for ph in self.pebble_handlers:
             if not ph.service_ready:
-                logging.debug(
-                    f"Aborting container {ph.service_name} service not ready"
+                logger.debug(
+                    "Aborting container %s service not ready", ph.service_name
                 )
                 return
 
         if not self.bootstrapped():
             if not self._do_bootstrap():
                 self._state.bootstrapped = False
-                logging.warning(
+                logger.warning(
                     "Failed to bootstrap the service, event deferred"
                 )
                 # Defer the event to re-trigger the bootstrap process
@@ -286,7 +292,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
     @property
     def supports_peer_relation(self) -> bool:
         """Whether the charm support the peers relation."""
-        return "peers" in self.meta.relations.keys()
+        return "peers" in self.meta.relations
 
     @property
     def container_configs(self) -> List[sunbeam_core.ContainerConfigFile]:
@@ -341,7 +347,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         """Determine whether all containers are ready for configuration."""
         for ph in self.pebble_handlers:
             if not ph.service_ready:
-                logger.info(f"Container incomplete: {ph.container_name}")
+                logger.info("Container incomplete: %s", ph.container_name)
                 return False
         return True
 
@@ -357,7 +363,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         )
 
         if len(not_ready_relations) != 0:
-            logger.info(f"Relations {not_ready_relations} incomplete")
+            logger.info("Relations %s incomplete", not_ready_relations)
             return False
 
         return True
@@ -366,10 +372,11 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         """Construct context for rendering templates."""
         ra = sunbeam_core.OPSCharmContexts(self)
         for handler in self.relation_handlers:
-            if handler.relation_name not in self.meta.relations.keys():
+            if handler.relation_name not in self.meta.relations:
                 logger.info(
-                    f"Dropping handler for relation {handler.relation_name}, "
-                    "relation not present in charm metadata"
+                    "Dropping handler for relation %s, relation not present "
+                    "in charm metadata",
+                    handler.relation_name,
                 )
                 continue
             if handler.ready:
@@ -410,7 +417,7 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
         :raises: pebble.ExecError
         """
         if not self.unit.is_leader():
-            logging.info("Not lead unit, skipping DB syncs")
+            logger.info("Not lead unit, skipping DB syncs")
             return
         try:
             if self.db_sync_cmds:
@@ -419,13 +426,13 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
                     self.db_sync_container_name
                 )
                 for cmd in self.db_sync_cmds:
-                    logging.debug("Running sync: \n%s", cmd)
+                    logger.debug("Running sync: \n%s", cmd)
                     process = container.exec(cmd, timeout=5 * 60)
                     out, warnings = process.wait_output()
                     if warnings:
                         for line in warnings.splitlines():
                             logger.warning("DB Sync Out: %s", line.strip())
-                    logging.debug("Output from database sync: \n%s", out)
+                    logger.debug("Output from database sync: \n%s", out)
         except AttributeError:
             logger.warning(
                 "Not DB sync ran. Charm does not specify self.db_sync_cmds"
@@ -452,11 +459,17 @@ class OSBaseOperatorCharm(ops.charm.CharmBase):
 class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
     """Base class for OpenStack API operators."""
 
-    mandatory_relations = {"database", "identity-service", "ingress-public"}
+    mandatory_relations = frozenset(
+        {"database", "identity-service", "ingress-public"}
+    )
 
     def __init__(self, framework: ops.framework.Framework) -> None:
         """Run constructor."""
         super().__init__(framework)
+        # Lazy import so that charms which do not expose an API service
+        # do not pay for importing lightkube on every hook.
+        import charms.observability_libs.v0.kubernetes_service_patch as kube_svc_patch
+
         self.service_patcher = kube_svc_patch.KubernetesServicePatch(
             self,
             ports=[(f"{self.app.name}", self.default_public_ingress_port)],
@@ -530,6 +543,15 @@ class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
         """Service url for accessing this service via the given hostname."""
         return f"http://{hostname}:{self.default_public_ingress_port}"
 
+    @cached_property
+    def _lightkube_client(self) -> "lightkube.Client":
+        """Kubernetes API client, created on first use."""
+        from lightkube import (
+            Client,
+        )
+
+        return Client()
+
     @property
     def public_ingress_address(self) -> str:
         """IP address or hostname for access to this service."""
@@ -537,8 +559,11 @@ class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
         if svc_hostname:
             return svc_hostname
 
-        client = Client()
-        charm_service = client.get(
+        from lightkube.resources.core_v1 import (
+            Service,
+        )
+
+        charm_service = self._lightkube_client.get(
             Service, name=self.app.name, namespace=self.model.name
         )
 
@@ -549,14 +574,14 @@ class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
                 ingress_addresses = load_balancer_status.ingress
                 if ingress_addresses:
                     logger.debug(
-                        "Found ingress addresses on loadbalancer " "status"
+                        "Found ingress addresses on loadbalancer status"
                     )
                     ingress_address = ingress_addresses[0]
                     addr = ingress_address.hostname or ingress_address.ip
                     if addr:
                         logger.debug(
-                            "Using ingress address from loadbalancer "
-                            f"as {addr}"
+                            "Using ingress address from loadbalancer as %s",
+                            addr,
                         )
                         return ingress_address.hostname or ingress_address.ip
 
@@ -647,7 +672,7 @@ class OSBaseOperatorAPICharm(OSBaseOperatorCharm):
         """Service group file and directory ownership."""
         return self.service_name
 
-    @property
+    @cached_property
     def service_conf(self) -> str:
         """Service default configuration file."""
         return f"/etc/{self.service_name}/{self.service_name}.conf"
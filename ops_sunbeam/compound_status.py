@@ -196,29 +196,30 @@ class StatusPool(Object):
 
         Will be a multi-line string.
         """
-        lines = []
-        for status in sorted(self._pool.values(), key=lambda x: x.priority()):
-            lines.append(
-                "{label:>30}: {status:>10} | {message}".format(
-                    label=status.label,
-                    message=status.message(),
-                    status=status.status.name,
-                )
+        return "\n".join(
+            f"{status.label:>30}: {status.status.name:>10} | "
+            f"{status.message()}"
+            for status in sorted(
+                self._pool.values(), key=lambda x: x.priority()
             )
-
-        return "\n".join(lines)
+        )
 
     def _on_commit(self, _event: CommitEvent) -> None:
         """Store the current state of statuses.
 
         So we can restore them on the next run of the charm.
         """
-        self._state["statuses"] = json.dumps(
+        statuses = json.dumps(
             {
                 status.label: status._serialize()
                 for status in self._pool.values()
             }
         )
+        # Statuses can be assigned directly, so compare the serialized
+        # pool rather than tracking changes; skip the write if unchanged.
+        if "statuses" in self._state and self._state["statuses"] == statuses:
+            return
+        self._state["statuses"] = statuses
         self._charm.framework.save_snapshot(self._state)
         self._charm.framework._storage.commit()
 
@@ -227,10 +228,10 @@ class StatusPool(Object):
 
         Use as a hook to run whenever a status is updated in the pool.
         """
-        status = (
-            sorted(self._pool.values(), key=lambda x: x.priority())[0]
-            if self._pool
-            else None
+        # min() keeps the first of equal priority statuses, as the stable
+        # sort did, without sorting the whole pool.
+        status = min(
+            self._pool.values(), key=lambda x: x.priority(), default=None
         )
         if status is None or status.status.name == "unknown":
             self._charm.unit.status = WaitingStatus("no status set yet")
@@ -69,6 +69,8 @@ class PebbleHandler(ops.charm.Object):
         self.container_configs.extend(self.default_container_configs())
         self.template_dir = template_dir
         self.callback_f = callback_f
+        # Digests of the config file contents last written to the container
+        self._config_digests = {}
         self.setup_pebble_handler()
 
         self.status = compound_status.Status("container:" + container_name)
@@ -78,6 +80,11 @@ class PebbleHandler(ops.charm.Object):
             self.charm.on.update_status, self._on_update_status
         )
 
+    @property
+    def container(self) -> ops.model.Container:
+        """Container managed by this handler."""
+        return self.charm.unit.get_container(self.container_name)
+
     def setup_pebble_handler(self) -> None:
         """Configure handler for pebble ready event."""
         prefix = self.container_name.replace("-", "_")
@@ -107,7 +114,7 @@ class PebbleHandler(ops.charm.Object):
         :rtype: List
         """
         files_updated = []
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         if container:
             for config in self.container_configs:
                 changed = sunbeam_templating.sidecar_config_render(
@@ -115,6 +122,7 @@ class PebbleHandler(ops.charm.Object):
                     config,
                     self.template_dir,
                     context,
+                    self._config_digests,
                 )
                 if changed:
                     files_updated.append(config.path)
@@ -145,7 +153,7 @@ class PebbleHandler(ops.charm.Object):
     def setup_dirs(self) -> None:
         """Create directories in container."""
         if self.directories:
-            container = self.charm.unit.get_container(self.container_name)
+            container = self.container
             for d in self.directories:
                 logging.debug(f"Creating {d.path}")
                 container.make_dir(
@@ -176,14 +184,14 @@ class PebbleHandler(ops.charm.Object):
     @property
     def pebble_ready(self) -> bool:
         """Determine if pebble is running and ready for use."""
-        return self.charm.unit.get_container(self.container_name).can_connect()
+        return self.container.can_connect()
 
     @property
     def service_ready(self) -> bool:
         """Determine whether the service the container provides is running."""
         if not self.pebble_ready:
             return False
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         services = container.get_services()
         return all([s.is_running() for s in services.values()])
 
@@ -200,7 +208,7 @@ class PebbleHandler(ops.charm.Object):
         :param kwargs: arguments to pass into the ops.model.Container's
             execute command.
         """
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         process = container.exec(cmd, **kwargs)
         try:
             stdout, _ = process.wait_output()
@@ -225,7 +233,7 @@ class PebbleHandler(ops.charm.Object):
             logger.debug("Healthcheck layer not defined in pebble handler")
             return
 
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         try:
             plan = container.get_plan()
             if not plan.checks:
@@ -251,7 +259,7 @@ class PebbleHandler(ops.charm.Object):
             return
 
         failed = []
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         checks = container.get_checks(level=ops.pebble.CheckLevel.READY)
         for name, check in checks.items():
             if check.status != ops.pebble.CheckStatus.UP:
@@ -281,7 +289,7 @@ class PebbleHandler(ops.charm.Object):
 
         :param restart: Whether to stop services before starting them.
         """
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         services = container.get_services()
         for service_name, service in services.items():
             if not service.is_running():
@@ -320,7 +328,7 @@ class ServicePebbleHandler(PebbleHandler):
 
         :param restart: Whether to stop services before starting them.
         """
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         if not container:
             logger.debug(
                 f"{self.container_name} container is not ready. "
@@ -363,7 +371,7 @@ class WSGIPebbleHandler(PebbleHandler):
 
         :param restart: Whether to stop services before starting them.
         """
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
         if not container:
             logger.debug(
                 f"{self.container_name} container is not ready. "
@@ -423,7 +431,10 @@ class WSGIPebbleHandler(PebbleHandler):
 
     def init_service(self, context: sunbeam_core.OPSCharmContexts) -> None:
         """Enable and start WSGI service."""
-        container = self.charm.unit.get_container(self.container_name)
+        container = self.container
+        # The site configuration has to be in place before it can be
+        # enabled. Render it once and keep the result so that changes made
+        # here still trigger a restart below.
         files_changed = self.write_config(context)
         try:
             process = container.exec(
@@ -440,7 +451,6 @@ class WSGIPebbleHandler(PebbleHandler):
             )
             # ignore for now - pebble is raising an exited too quickly, but it
             # appears to work properly.
-        files_changed = self.write_config(context)
         if files_changed:
             self.start_wsgi(restart=True)
         else:
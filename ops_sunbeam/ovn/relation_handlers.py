@@ -15,12 +15,12 @@
 """Base classes for defining OVN relation handlers."""
 
 import ipaddress
-import itertools
 import logging
 import socket
 from typing import (
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
 )
@@ -54,27 +54,27 @@ class OVNRelationUtils:
         :rtype: str
         :raises: ValueError
         """
-        ipaddr = ipaddress.ip_address(addr)
-        if isinstance(ipaddr, ipaddress.IPv6Address):
-            fmt = "[{}]"
-        else:
-            fmt = "{}"
-        return fmt.format(ipaddr)
+        # Only IPv6 addresses contain a colon, so dispatch directly rather
+        # than letting ipaddress.ip_address try IPv4 first.
+        if ":" in addr:
+            return f"[{ipaddress.IPv6Address(addr)}]"
+        return str(ipaddress.IPv4Address(addr))
 
-    def _remote_addrs(self, key: str) -> Iterator[str]:
+    def _remote_addrs(self, key: str) -> List[str]:
         """Retrieve addresses published by remote units.
 
         :param key: Relation data key to retrieve value from.
         :type key: str
         :returns: addresses published by remote units.
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
+        addrs = []
         for addr in self.interface.get_all_unit_values(key):
             try:
-                addr = self._format_addr(addr)
-                yield addr
+                addrs.append(self._format_addr(addr))
             except ValueError:
                 continue
+        return addrs
 
     def _remote_hostnames(self, key: str) -> Iterator[str]:
         """Retrieve hostnames published by remote units.
@@ -97,30 +97,29 @@ class OVNRelationUtils:
         return self._remote_hostnames("bound-hostname")
 
     @property
-    def cluster_remote_addrs(self) -> Iterator[str]:
+    def cluster_remote_addrs(self) -> List[str]:
         """Retrieve remote addresses bound to remote endpoint.
 
         :returns: addresses bound to remote endpoints.
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
         return self._remote_addrs("bound-address")
 
     def db_connection_strs(
-        self, hostnames: List[str], port: int, proto: str = "ssl"
-    ) -> Iterator[str]:
+        self, hostnames: Iterable[str], port: int, proto: str = "ssl"
+    ) -> List[str]:
         """Provide connection strings.
 
         :param hostnames: List of hostnames to include in conn strs
-        :type hostnames: List[str]
+        :type hostnames: Iterable[str]
         :param port: Port number
         :type port: int
         :param proto: Protocol
         :type proto: str
         :returns: connection strings
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
-        for hostname in hostnames:
-            yield ":".join((proto, str(hostname), str(port)))
+        return [f"{proto}:{hostname}:{port}" for hostname in hostnames]
 
     @property
     def db_nb_port(self) -> int:
@@ -172,44 +171,44 @@ class OVNRelationUtils:
         return self.DB_SB_CLUSTER_PORT
 
     @property
-    def db_nb_connection_strs(self) -> Iterator[str]:
+    def db_nb_connection_strs(self) -> List[str]:
         """Provide OVN Northbound OVSDB connection strings.
 
         :returns: OVN Northbound OVSDB connection strings.
-        :rtpye: Iterator[str]
+        :rtpye: List[str]
         """
         return self.db_connection_strs(
             self.cluster_remote_addrs, self.db_nb_port
         )
 
     @property
-    def db_sb_connection_strs(self) -> Iterator[str]:
+    def db_sb_connection_strs(self) -> List[str]:
         """Provide OVN Southbound OVSDB connection strings.
 
         :returns: OVN Southbound OVSDB connection strings.
-        :rtpye: Iterator[str]
+        :rtpye: List[str]
         """
         return self.db_connection_strs(
             self.cluster_remote_addrs, self.db_sb_port
         )
 
     @property
-    def db_nb_connection_hostname_strs(self) -> Iterator[str]:
+    def db_nb_connection_hostname_strs(self) -> List[str]:
         """Provide OVN Northbound OVSDB connection strings.
 
         :returns: OVN Northbound OVSDB connection strings.
-        :rtpye: Iterator[str]
+        :rtpye: List[str]
         """
         return self.db_connection_strs(
             self.cluster_remote_hostnames, self.db_nb_port
         )
 
     @property
-    def db_sb_connection_hostname_strs(self) -> Iterator[str]:
+    def db_sb_connection_hostname_strs(self) -> List[str]:
         """Provide OVN Southbound OVSDB connection strings.
 
         :returns: OVN Southbound OVSDB connection strings.
-        :rtpye: Iterator[str]
+        :rtpye: List[str]
         """
         return self.db_connection_strs(
             self.cluster_remote_hostnames, self.db_sb_port
@@ -276,14 +275,24 @@ class OVNDBClusterPeerHandler(
         """
         joined_units = self.interface.all_joined_units()
         # Remove this unit from expected_peer_units count
-        expected_remote_units = self.interface.expected_peer_units() - 1
+        expected_remote_units = max(
+            0, self.interface.expected_peer_units() - 1
+        )
         if len(joined_units) < expected_remote_units:
             logging.debug(
                 f"Expected {expected_remote_units} but only {joined_units} "
                 "have joined so far"
             )
             return False
-        hostnames = self.interface.get_all_unit_values("bound-hostname")
+        # Units which have not published yet may hold an empty value, so
+        # only count the hostnames which are actually set.
+        hostnames = [
+            hostname
+            for hostname in self.interface.get_all_unit_values(
+                "bound-hostname"
+            )
+            if hostname
+        ]
         if len(hostnames) < expected_remote_units:
             logging.debug(
                 "Not all units have published a bound-hostname. Current "
@@ -297,64 +306,52 @@ class OVNDBClusterPeerHandler(
             return True
 
     @property
-    def db_nb_connection_strs(self) -> Iterator[str]:
+    def db_nb_connection_strs(self) -> List[str]:
         """Provide Northbound DB connection strings.
 
         We override the parent property because for the peer relation
         ``cluster_remote_hostnames`` does not contain self.
 
         :returns: Northbound DB connection strings
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
-        return itertools.chain(
-            self.db_connection_strs(
-                (self.cluster_local_hostname,), self.db_nb_port
-            ),
-            self.db_connection_strs(
-                self.cluster_remote_hostnames, self.db_nb_port
-            ),
+        return self.db_connection_strs(
+            [self.cluster_local_hostname, *self.cluster_remote_hostnames],
+            self.db_nb_port,
         )
 
     @property
-    def db_nb_cluster_connection_strs(self) -> Iterator[str]:
+    def db_nb_cluster_connection_strs(self) -> List[str]:
         """Provide Northbound DB Cluster connection strings.
 
         We override the parent property because for the peer relation
         ``cluster_remote_hostnames`` does not contain self.
 
         :returns: Northbound DB connection strings
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
-        return itertools.chain(
-            self.db_connection_strs(
-                (self.cluster_local_hostname,), self.db_nb_cluster_port
-            ),
-            self.db_connection_strs(
-                self.cluster_remote_hostnames, self.db_nb_cluster_port
-            ),
+        return self.db_connection_strs(
+            [self.cluster_local_hostname, *self.cluster_remote_hostnames],
+            self.db_nb_cluster_port,
         )
 
     @property
-    def db_sb_cluster_connection_strs(self) -> Iterator[str]:
+    def db_sb_cluster_connection_strs(self) -> List[str]:
         """Provide Southbound DB Cluster connection strings.
 
         We override the parent property because for the peer relation
         ``cluster_remote_hostnames`` does not contain self.
 
         :returns: Southbound DB connection strings
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
-        return itertools.chain(
-            self.db_connection_strs(
-                (self.cluster_local_hostname,), self.db_sb_cluster_port
-            ),
-            self.db_connection_strs(
-                self.cluster_remote_hostnames, self.db_sb_cluster_port
-            ),
+        return self.db_connection_strs(
+            [self.cluster_local_hostname, *self.cluster_remote_hostnames],
+            self.db_sb_cluster_port,
         )
 
     @property
-    def db_sb_connection_strs(self) -> Iterator[str]:
+    def db_sb_connection_strs(self) -> List[str]:
         """Provide Southbound DB connection strings.
 
         We override the parent property because for the peer relation
@@ -363,15 +360,11 @@ class OVNDBClusterPeerHandler(
         that provide the privileges ``ovn-northd`` requires to operate.
 
         :returns: Southbound DB connection strings
-        :rtype: Iterator[str]
+        :rtype: List[str]
         """
-        return itertools.chain(
-            self.db_connection_strs(
-                (self.cluster_local_hostname,), self.db_sb_admin_port
-            ),
-            self.db_connection_strs(
-                self.cluster_remote_hostnames, self.db_sb_admin_port
-            ),
+        return self.db_connection_strs(
+            [self.cluster_local_hostname, *self.cluster_remote_hostnames],
+            self.db_sb_admin_port,
         )
 
     def _on_peers_relation_joined(
@@ -386,13 +379,16 @@ class OVNDBClusterPeerHandler(
         ctxt.update(
             {
                 "cluster_local_hostname": self.cluster_local_hostname,
-                "cluster_remote_hostnames": self.cluster_remote_hostnames,
+                # A list so templates can iterate the hostnames repeatedly.
+                "cluster_remote_hostnames": list(
+                    self.cluster_remote_hostnames
+                ),
                 "db_nb_cluster_connection_strs": self.db_nb_cluster_connection_strs,
                 "db_sb_cluster_connection_strs": self.db_sb_cluster_connection_strs,
                 "db_sb_cluster_port": self.db_sb_cluster_port,
                 "db_nb_cluster_port": self.db_nb_cluster_port,
-                "db_nb_connection_strs": list(self.db_nb_connection_strs),
-                "db_sb_connection_strs": list(self.db_sb_connection_strs),
+                "db_nb_connection_strs": self.db_nb_connection_strs,
+                "db_sb_connection_strs": self.db_sb_connection_strs,
             }
         )
         return ctxt
@@ -14,8 +14,10 @@
 
 """Base classes for defining a charm using the Operator framework."""
 
-import json
 import logging
+from functools import (
+    lru_cache,
+)
 from typing import (
     Callable,
     List,
@@ -43,6 +45,14 @@ logger = logging.getLogger(__name__)
 
 ERASURE_CODED = "erasure-coded"
 REPLICATED = "replicated"
+# JSON encoding of True, as published under BasePeerHandler.LEADER_READY_KEY
+_TRUE = "true"
+
+
+@lru_cache(maxsize=4)
+def _sorted_join(hosts: Tuple[str, ...]) -> str:
+    """Return hosts sorted and joined into a comma separated string."""
+    return ",".join(sorted(hosts))
 
 
 class RelationHandler(ops.charm.Object):
@@ -408,24 +418,19 @@ class RabbitMQHandler(RelationHandler):
         if not hosts:
             return {}
         ctxt = super().context()
-        ctxt["hostnames"] = list(set(ctxt["hostnames"]))
-        ctxt["hosts"] = ",".join(ctxt["hostnames"])
-        ctxt["port"] = ctxt.get("ssl_port") or self.DEFAULT_PORT
+        # Deduplicate preserving order so the rendered output is stable
+        # between hooks and does not trigger needless service restarts.
+        hostnames = list(dict.fromkeys(ctxt["hostnames"]))
+        user, password = self.username, ctxt["password"]
+        port = ctxt.get("ssl_port") or self.DEFAULT_PORT
+        ctxt["hostnames"] = hostnames
+        ctxt["hosts"] = ",".join(hostnames)
+        ctxt["port"] = port
+        # TODO deal with IPv6
         transport_url_hosts = ",".join(
-            [
-                "{}:{}@{}:{}".format(
-                    self.username,
-                    ctxt["password"],
-                    host_,  # TODO deal with IPv6
-                    ctxt["port"],
-                )
-                for host_ in ctxt["hostnames"]
-            ]
-        )
-        transport_url = "rabbit://{}/{}".format(
-            transport_url_hosts, self.vhost
+            f"{user}:{password}@{host_}:{port}" for host_ in hostnames
         )
-        ctxt["transport_url"] = transport_url
+        ctxt["transport_url"] = f"rabbit://{transport_url_hosts}/{self.vhost}"
         return ctxt
 
 
@@ -568,15 +573,11 @@ class BasePeerHandler(RelationHandler):
 
     def set_leader_ready(self) -> None:
         """Tell peers the leader is ready."""
-        self.set_app_data({self.LEADER_READY_KEY: json.dumps(True)})
+        self.set_app_data({self.LEADER_READY_KEY: _TRUE})
 
     def is_leader_ready(self) -> bool:
         """Whether the leader has announced it is ready."""
-        ready = self.get_app_data(self.LEADER_READY_KEY)
-        if ready is None:
-            return False
-        else:
-            return json.loads(ready)
+        return self.get_app_data(self.LEADER_READY_KEY) == _TRUE
 
 
 class CephClientHandler(RelationHandler):
@@ -630,72 +631,18 @@ class CephClientHandler(RelationHandler):
         handler and use the required broker methods on the underlying
         interface object.
         """
-        config = self.model.config.get
+        config = dict(self.model.config).get
         data_pool_name = (
             config("rbd-pool-name")
             or config("rbd-pool")
             or self.charm.app.name
         )
-        metadata_pool_name = (
-            config("ec-rbd-metadata-pool") or f"{self.charm.app.name}-metadata"
-        )
         weight = config("ceph-pool-weight")
         replicas = config("ceph-osd-replication-count")
         # TODO: add bluestore compression options
         if config("pool-type") == ERASURE_CODED:
-            # General EC plugin config
-            plugin = config("ec-profile-plugin")
-            technique = config("ec-profile-technique")
-            device_class = config("ec-profile-device-class")
-            bdm_k = config("ec-profile-k")
-            bdm_m = config("ec-profile-m")
-            # LRC plugin config
-            bdm_l = config("ec-profile-locality")
-            crush_locality = config("ec-profile-crush-locality")
-            # SHEC plugin config
-            bdm_c = config("ec-profile-durability-estimator")
-            # CLAY plugin config
-            bdm_d = config("ec-profile-helper-chunks")
-            scalar_mds = config("ec-profile-scalar-mds")
-            # Profile name
-            profile_name = (
-                config("ec-profile-name") or f"{self.charm.app.name}-profile"
-            )
-            # Metadata sizing is approximately 1% of overall data weight
-            # but is in effect driven by the number of rbd's rather than
-            # their size - so it can be very lightweight.
-            metadata_weight = weight * 0.01
-            # Resize data pool weight to accommodate metadata weight
-            weight = weight - metadata_weight
-            # Create erasure profile
-            self.interface.create_erasure_profile(
-                name=profile_name,
-                k=bdm_k,
-                m=bdm_m,
-                lrc_locality=bdm_l,
-                lrc_crush_locality=crush_locality,
-                shec_durability_estimator=bdm_c,
-                clay_helper_chunks=bdm_d,
-                clay_scalar_mds=scalar_mds,
-                device_class=device_class,
-                erasure_type=plugin,
-                erasure_technique=technique,
-            )
-
-            # Create EC data pool
-            self.interface.create_erasure_pool(
-                name=data_pool_name,
-                erasure_profile=profile_name,
-                weight=weight,
-                allow_ec_overwrites=self.allow_ec_overwrites,
-                app_name=self.app_name,
-            )
-            # Create EC metadata pool
-            self.interface.create_replicated_pool(
-                name=metadata_pool_name,
-                replicas=replicas,
-                weight=metadata_weight,
-                app_name=self.app_name,
+            self._request_erasure_coded_pools(
+                config, data_pool_name, weight, replicas
             )
         else:
             self.interface.create_replicated_pool(
@@ -705,6 +652,72 @@ class CephClientHandler(RelationHandler):
                 app_name=self.app_name,
             )
 
+    def _request_erasure_coded_pools(
+        self,
+        config: Callable,
+        data_pool_name: str,
+        weight: float,
+        replicas: int,
+    ) -> None:
+        """Request an erasure profile plus EC data and metadata pools."""
+        metadata_pool_name = (
+            config("ec-rbd-metadata-pool") or f"{self.charm.app.name}-metadata"
+        )
+        # General EC plugin config
+        plugin = config("ec-profile-plugin")
+        technique = config("ec-profile-technique")
+        device_class = config("ec-profile-device-class")
+        bdm_k = config("ec-profile-k")
+        bdm_m = config("ec-profile-m")
+        # LRC plugin config
+        bdm_l = config("ec-profile-locality")
+        crush_locality = config("ec-profile-crush-locality")
+        # SHEC plugin config
+        bdm_c = config("ec-profile-durability-estimator")
+        # CLAY plugin config
+        bdm_d = config("ec-profile-helper-chunks")
+        scalar_mds = config("ec-profile-scalar-mds")
+        # Profile name
+        profile_name = (
+            config("ec-profile-name") or f"{self.charm.app.name}-profile"
+        )
+        # Metadata sizing is approximately 1% of overall data weight
+        # but is in effect driven by the number of rbd's rather than
+        # their size - so it can be very lightweight.
+        metadata_weight = weight * 0.01
+        # Resize data pool weight to accommodate metadata weight
+        weight = weight - metadata_weight
+        # Create erasure profile
+        self.interface.create_erasure_profile(
+            name=profile_name,
+            k=bdm_k,
+            m=bdm_m,
+            lrc_locality=bdm_l,
+            lrc_crush_locality=crush_locality,
+            shec_durability_estimator=bdm_c,
+            clay_helper_chunks=bdm_d,
+            clay_scalar_mds=scalar_mds,
+            device_class=device_class,
+            erasure_type=plugin,
+            erasure_technique=technique,
+        )
+
+        # Create EC data pool
+        self.interface.create_erasure_pool(
+            name=data_pool_name,
+            erasure_profile=profile_name,
+            weight=weight,
+            allow_ec_overwrites=self.allow_ec_overwrites,
+            app_name=self.app_name,
+        )
+        # Create EC metadata pool
+        self.interface.create_replicated_pool(
+            name=metadata_pool_name,
+            replicas=replicas,
+            weight=metadata_weight,
+            app_name=self.app_name,
+        )
+
     @property
     def ready(self) -> bool:
         """Whether handler ready for use."""
@@ -719,7 +732,7 @@ class CephClientHandler(RelationHandler):
         """Context containing Ceph connection data."""
         ctxt = super().context()
         data = self.interface.get_relation_data()
-        ctxt["mon_hosts"] = ",".join(sorted(data.get("mon_hosts")))
+        ctxt["mon_hosts"] = _sorted_join(tuple(data.get("mon_hosts") or ()))
         ctxt["auth"] = data.get("auth")
         ctxt["key"] = data.get("key")
         ctxt["rbd_features"] = None
@@ -744,6 +757,7 @@ class CertificatesHandler(RelationHandler):
 
         self.ca_client = ca_client
         self.sans = sans
+        self._pem_cache = None
         super().__init__(charm, relation_name, callback_f, mandatory)
 
     def setup_event_handler(self) -> None:
@@ -765,10 +779,12 @@ class CertificatesHandler(RelationHandler):
         self.interface.request_server_certificate(
             self.model.unit.name.replace("/", "-"), self.sans
         )
+        self._pem_cache = None
         self.callback_f(event)
 
     def _certs_ready(self, event: ops.framework.EventBase) -> None:
         """Request Certificates."""
+        self._pem_cache = None
         self.callback_f(event)
 
     @property
@@ -778,6 +794,12 @@ class CertificatesHandler(RelationHandler):
 
     def context(self) -> dict:
         """Certificates context."""
+        if self._pem_cache is None:
+            self._pem_cache = self._encode_pem()
+        return dict(self._pem_cache)
+
+    def _encode_pem(self) -> dict:
+        """PEM encode the key and certificates from the interface."""
         key = self.interface.server_key.private_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PrivateFormat.TraditionalOpenSSL,
@@ -804,12 +826,11 @@ class CertificatesHandler(RelationHandler):
             )
             + root_ca_chain
         )
-        ctxt = {
+        return {
             "key": key.decode(),
             "cert": cert.decode(),
             "ca_cert": ca_cert.decode(),
         }
-        return ctxt
 
 
 class CloudCredentialsRequiresHandler(RelationHandler):
@@ -14,14 +14,21 @@
 
 """Module for rendering templates inside containers."""
 
+import hashlib
 import logging
 import os
+from functools import (
+    lru_cache,
+)
 from pathlib import (
     Path,
 )
 from typing import (
     TYPE_CHECKING,
+    Dict,
     List,
+    Optional,
+    Tuple,
 )
 
 import ops.pebble
@@ -38,12 +45,60 @@ log = logging.getLogger(__name__)
 def get_container(
     containers: List["ops.model.Container"], name: str
 ) -> "ops.model.Container":
-    """Search for container with given name inlist of containers."""
-    container = None
-    for c in containers:
-        if c.name == name:
-            container = c
-    return container
+    """Search for container with given name in list of containers."""
+    # Search from the end so the last match wins, as it always has.
+    return next((c for c in reversed(containers) if c.name == name), None)
+
+
+def _get_bytecode_cache() -> Optional[jinja2.BytecodeCache]:
+    """Return a bytecode cache which persists between hook executions.
+
+    Jinja keeps the compiled templates in a private per user temporary
+    directory. If that directory cannot be used, templates are simply
+    compiled on each run.
+    """
+    try:
+        return jinja2.FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        log.debug("Jinja bytecode cache unavailable", exc_info=True)
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_env(template_dir: str) -> jinja2.Environment:
+    """Return the Jinja environment for template_dir.
+
+    The environment is shared between renders so templates are only
+    parsed and compiled once per process.
+    """
+    loader = jinja2.FileSystemLoader(template_dir)
+    return jinja2.Environment(
+        loader=loader,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=_get_bytecode_cache(),
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_template(template_dir: str, path: str) -> jinja2.Template:
+    """Return the template used to render the file at path.
+
+    A template named after the file with a ``.j2`` suffix is preferred
+    over one named exactly after the file.
+    """
+    name = os.path.basename(path)
+    return _get_env(template_dir).select_template([name + ".j2", name])
+
+
+def clear_template_cache() -> None:
+    """Drop the cached Jinja environments and templates.
+
+    Use this when the templates or the loader may have changed since they
+    were first used, for example between unit tests.
+    """
+    _get_template.cache_clear()
+    _get_env.cache_clear()
 
 
 def sidecar_config_render(
@@ -51,26 +106,30 @@ def sidecar_config_render(
     config: "sunbeam_core.ContainerConfigFile",
     template_dir: str,
     context: "sunbeam_core.OPSCharmContexts",
+    digests: Optional[Dict[Tuple[str, str], bytes]] = None,
 ) -> bool:
     """Render templates inside containers.
 
+    :param digests: Digests of the contents last written to each
+        (container name, path). If the rendered contents match, the file
+        is neither pulled nor pushed. Updated in place.
     :return: Whether file was updated.
     :rtype: bool
     """
     file_updated = False
+    template = _get_template(template_dir, config.path)
+    contents = template.render(context)
+    digest_key = (container.name, config.path)
+    digest = hashlib.sha256(contents.encode()).digest()
+    if digests is not None and digests.get(digest_key) == digest:
+        log.debug(
+            f"{config.path} in {container.name} unchanged since last write."
+        )
+        return False
     try:
         original_contents = container.pull(config.path).read()
     except (ops.pebble.PathError, FileNotFoundError):
         original_contents = None
-    loader = jinja2.FileSystemLoader(template_dir)
-    _tmpl_env = jinja2.Environment(loader=loader)
-    try:
-        template = _tmpl_env.get_template(
-            os.path.basename(config.path) + ".j2"
-        )
-    except jinja2.exceptions.TemplateNotFound:
-        template = _tmpl_env.get_template(os.path.basename(config.path))
-    contents = template.render(context)
     if original_contents == contents:
         log.debug(
             f"{config.path} in {container.name} matches desired content."
@@ -89,4 +148,6 @@ def sidecar_config_render(
         log.debug(
             f"Wrote template {config.path} in container {container.name}."
         )
+    if digests is not None:
+        digests[digest_key] = digest
     return file_updated
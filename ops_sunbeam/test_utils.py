@@ -16,12 +16,19 @@
 
 """Module containing shared code to be used in a charms units tests."""
 
+from __future__ import (
+    annotations,
+)
+
 import collections
+import contextlib
+import functools
 import inspect
 import json
 import os
 import pathlib
 import sys
+import textwrap
 import typing
 import unittest
 from typing import (
@@ -29,8 +36,8 @@ from typing import (
 )
 
 import ops
+import yaml
 from mock import (
-    MagicMock,
     Mock,
     patch,
 )
@@ -49,6 +56,13 @@ from ops.testing import (
     _TestingPebbleClient,
 )
 
+import ops_sunbeam.templating as sunbeam_templating
+
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
 TEST_CA = """-----BEGIN CERTIFICATE-----
 MIIDADCCAeigAwIBAgIUOTGfdiGSlKoiyWskxH1za0Nh7cYwDQYJKoZIhvcNAQEL
 BQAwGjEYMBYGA1UEAwwPRGl2aW5lQXV0aG9yaXR5MB4XDTIyMDIwNjE4MjYyM1oX
@@ -143,9 +157,79 @@ ULTaKTN2gp7E2BuxENtAyplrvLiXXYH3CqT528JgMdMm0al6X3MXo9WqbOg/KNpa
 -----END RSA PRIVATE KEY-----"""
 
 
+_IDENTITY_SERVICE_DATA = {
+    "admin-domain-id": "admindomid1",
+    "admin-project-id": "adminprojid1",
+    "admin-user-id": "adminuserid1",
+    "api-version": "3",
+    "auth-host": "keystone.local",
+    "auth-port": "12345",
+    "auth-protocol": "http",
+    "internal-host": "keystone.internal",
+    "internal-port": "5000",
+    "internal-protocol": "http",
+    "service-domain": "servicedom",
+    "service-domain_id": "svcdomid1",
+    "service-host": "keystone.service",
+    "service-password": "svcpass1",
+    "service-port": "5000",
+    "service-protocol": "http",
+    "service-project": "svcproj1",
+    "service-project-id": "svcprojid1",
+    "service-user-name": "svcuser1",
+}
+
+_CLOUD_CREDENTIALS_DATA = {
+    "api-version": "3",
+    "auth-host": "keystone.local",
+    "auth-port": "12345",
+    "auth-protocol": "http",
+    "internal-host": "keystone.internal",
+    "internal-port": "5000",
+    "internal-protocol": "http",
+    "username": "username",
+    "password": "user-password",
+    "project-name": "user-project",
+    "project-id": "uproj-id",
+    "user-domain-name": "udomain-name",
+    "user-domain-id": "udomain-id",
+    "project-domain-name": "pdomain_-ame",
+    "project-domain-id": "pdomain-id",
+    "region": "region12",
+}
+
+_DB_CREDENTIALS_DATA = {
+    "username": "foo",
+    "password": "hardpassword",
+    "endpoints": "10.0.0.10",
+}
+
+# Network data returned for every binding. ops only reads it when building
+# the Network, so one shared dict is safe.
+_NETWORK_DATA = {
+    "bind-addresses": [
+        {
+            "interface-name": "eth0",
+            "addresses": [{"cidr": "10.0.0.0/24", "value": "10.0.0.10"}],
+        }
+    ],
+    "ingress-addresses": ["10.0.0.10"],
+    "egress-subnets": ["10.0.0.0/24"],
+}
+
+
 class ContainerCalls:
     """Object to log container calls."""
 
+    __slots__ = (
+        "start",
+        "stop",
+        "push",
+        "pull",
+        "execute",
+        "remove_path",
+    )
+
     def __init__(self) -> None:
         """Init container calls."""
         self.start = collections.defaultdict(list)
@@ -221,11 +305,16 @@ class ContainerCalls:
 class CharmTestCase(unittest.TestCase):
     """Class to make mocking easier."""
 
-    container_calls = ContainerCalls()
-
     def setUp(self, obj: "typing.ANY", patches: "typing.List") -> None:
         """Run constructor."""
         super().setUp()
+        # Templates are cached per process, start each test without them.
+        sunbeam_templating.clear_template_cache()
+        self.addCleanup(sunbeam_templating.clear_template_cache)
+        # Subclasses may set up their own log before calling this, otherwise
+        # each test gets a fresh one.
+        if not hasattr(self, "container_calls"):
+            self.container_calls = ContainerCalls()
         self.patches = patches
         self.obj = obj
         self.patch_all()
@@ -246,8 +335,15 @@ class CharmTestCase(unittest.TestCase):
 
     def patch_all(self) -> None:
         """Patch all objects in self.patches."""
+        # Undo all of the patches with a single cleanup.
+        stack = contextlib.ExitStack()
+        self.addCleanup(stack.close)
         for method in self.patches:
-            setattr(self, method, self.patch(method))
+            setattr(
+                self,
+                method,
+                stack.enter_context(patch.object(self.obj, method)),
+            )
 
     def check_file(
         self,
@@ -310,7 +406,6 @@ def add_base_amqp_relation(harness: Harness) -> str:
     """Add amqp relation."""
     rel_id = harness.add_relation("amqp", "rabbitmq")
     harness.add_relation_unit(rel_id, "rabbitmq/0")
-    harness.add_relation_unit(rel_id, "rabbitmq/0")
     harness.update_relation_data(
         rel_id, "rabbitmq/0", {"ingress-address": "10.0.0.13"}
     )
@@ -330,7 +425,6 @@ def add_base_identity_service_relation(harness: Harness) -> str:
     """Add identity-service relation."""
     rel_id = harness.add_relation("identity-service", "keystone")
     harness.add_relation_unit(rel_id, "keystone/0")
-    harness.add_relation_unit(rel_id, "keystone/0")
     harness.update_relation_data(
         rel_id, "keystone/0", {"ingress-address": "10.0.0.33"}
     )
@@ -341,38 +435,13 @@ def add_identity_service_relation_response(
     harness: Harness, rel_id: str
 ) -> None:
     """Add id service data to identity-service relation."""
-    harness.update_relation_data(
-        rel_id,
-        "keystone",
-        {
-            "admin-domain-id": "admindomid1",
-            "admin-project-id": "adminprojid1",
-            "admin-user-id": "adminuserid1",
-            "api-version": "3",
-            "auth-host": "keystone.local",
-            "auth-port": "12345",
-            "auth-protocol": "http",
-            "internal-host": "keystone.internal",
-            "internal-port": "5000",
-            "internal-protocol": "http",
-            "service-domain": "servicedom",
-            "service-domain_id": "svcdomid1",
-            "service-host": "keystone.service",
-            "service-password": "svcpass1",
-            "service-port": "5000",
-            "service-protocol": "http",
-            "service-project": "svcproj1",
-            "service-project-id": "svcprojid1",
-            "service-user-name": "svcuser1",
-        },
-    )
+    harness.update_relation_data(rel_id, "keystone", _IDENTITY_SERVICE_DATA)
 
 
 def add_base_cloud_credentials_relation(harness: Harness) -> str:
     """Add identity-service relation."""
     rel_id = harness.add_relation("cloud-credentials", "keystone")
     harness.add_relation_unit(rel_id, "keystone/0")
-    harness.add_relation_unit(rel_id, "keystone/0")
     harness.update_relation_data(
         rel_id, "keystone/0", {"ingress-address": "10.0.0.35"}
     )
@@ -383,35 +452,13 @@ def add_cloud_credentials_relation_response(
     harness: Harness, rel_id: str
 ) -> None:
     """Add id service data to identity-service relation."""
-    harness.update_relation_data(
-        rel_id,
-        "keystone",
-        {
-            "api-version": "3",
-            "auth-host": "keystone.local",
-            "auth-port": "12345",
-            "auth-protocol": "http",
-            "internal-host": "keystone.internal",
-            "internal-port": "5000",
-            "internal-protocol": "http",
-            "username": "username",
-            "password": "user-password",
-            "project-name": "user-project",
-            "project-id": "uproj-id",
-            "user-domain-name": "udomain-name",
-            "user-domain-id": "udomain-id",
-            "project-domain-name": "pdomain_-ame",
-            "project-domain-id": "pdomain-id",
-            "region": "region12",
-        },
-    )
+    harness.update_relation_data(rel_id, "keystone", _CLOUD_CREDENTIALS_DATA)
 
 
 def add_base_db_relation(harness: Harness) -> str:
     """Add db relation."""
     rel_id = harness.add_relation("database", "mysql")
     harness.add_relation_unit(rel_id, "mysql/0")
-    harness.add_relation_unit(rel_id, "mysql/0")
     harness.update_relation_data(
         rel_id, "mysql/0", {"ingress-address": "10.0.0.3"}
     )
@@ -420,15 +467,7 @@ def add_base_db_relation(harness: Harness) -> str:
 
 def add_db_relation_credentials(harness: Harness, rel_id: str) -> None:
     """Add db credentials data to db relation."""
-    harness.update_relation_data(
-        rel_id,
-        "mysql",
-        {
-            "username": "foo",
-            "password": "hardpassword",
-            "endpoints": "10.0.0.10",
-        },
-    )
+    harness.update_relation_data(rel_id, "mysql", _DB_CREDENTIALS_DATA)
 
 
 def add_api_relations(harness: Harness) -> None:
@@ -570,13 +609,15 @@ test_relations = {
 }
 
 
-def add_all_relations(harness: Harness) -> None:
+def add_all_relations(harness: Harness) -> typing.Dict[str, int]:
     """Add all the relations there are test relations for."""
     rel_ids = {}
-    for key in harness._meta.relations.keys():
-        if test_relations.get(key):
-            rel_id = test_relations[key](harness)
-            rel_ids[key] = rel_id
+    # Relations are added in metadata order, as charms may depend on the
+    # order in which their relations are established.
+    for key in harness._meta.relations:
+        add_relation = test_relations.get(key)
+        if add_relation:
+            rel_ids[key] = add_relation(harness)
     return rel_ids
 
 
@@ -596,6 +637,138 @@ def set_remote_leader_ready(
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _read_file(path: str, mtime: float) -> str:
+    """Return the contents of path as of mtime."""
+    with open(path) as f:
+        return f.read()
+
+
+def _read_charm_file(path: str) -> typing.Optional[str]:
+    """Return the contents of a charm file, cached across harnesses.
+
+    The cache is keyed on the modification time so edits made while a test
+    run is in progress are still picked up.
+    """
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    return _read_file(path, mtime)
+
+
+@functools.lru_cache(maxsize=None)
+def _charm_dir(charm_class: typing.Type[ops.charm.CharmBase]) -> pathlib.Path:
+    """Return the root directory of the charm defining charm_class."""
+    filename = inspect.getfile(charm_class)
+    # Use pathlib.Path(filename).parents[1] if tests structure is
+    # <charm>/unit_tests
+    # Use pathlib.Path(filename).parents[2] if tests structure is
+    # <charm>/tests/unit/
+    return pathlib.Path(filename).parents[2]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_charm_config(charm_config: str) -> dict:
+    """Parse charm config YAML, cached across harnesses."""
+    return yaml.load(textwrap.dedent(charm_config), Loader=_YAMLLoader)
+
+
+class _FakeExecProcess:
+    """Process returned by the testing pebble client exec.
+
+    Every command succeeds immediately with no output.
+    """
+
+    __slots__ = ()
+
+    stdin = None
+    stdout = None
+    stderr = None
+
+    def wait(self) -> None:
+        """Wait for the command to complete."""
+
+    def wait_output(self) -> typing.Tuple[str, None]:
+        """Wait for the command to complete and return its output."""
+        return ("", None)
+
+    def send_signal(self, sig: typing.Union[int, str]) -> None:
+        """Send a signal to the running process."""
+
+
+_FAKE_EXEC_PROCESS = _FakeExecProcess()
+
+
+class _OSTestingPebbleClient(_TestingPebbleClient):
+    """Testing pebble client which records container calls."""
+
+    container_calls: ContainerCalls = None
+
+    def exec(
+        self,
+        command: typing.List[str],
+        *,
+        environment: typing.Dict[str, str] = None,
+        working_dir: str = None,
+        timeout: float = None,
+        user_id: int = None,
+        user: str = None,
+        group_id: int = None,
+        group: str = None,
+        stdin: typing.Union[str, bytes, typing.TextIO, typing.BinaryIO] = None,
+        stdout: typing.Union[typing.TextIO, typing.BinaryIO] = None,
+        stderr: typing.Union[typing.TextIO, typing.BinaryIO] = None,
+        encoding: str = "utf-8",
+        combine_stderr: bool = False,
+    ) -> _FakeExecProcess:
+        self.container_calls.add_execute(self.container_name, command)
+        return _FAKE_EXEC_PROCESS
+
+    def start_services(
+        self,
+        services: List[str],
+        timeout: float = 30.0,
+        delay: float = 0.1,
+    ) -> None:
+        """Record start service events."""
+        super().start_services(services, timeout, delay)
+        self.container_calls.add_start(self.container_name, services)
+
+    def stop_services(
+        self,
+        services: List[str],
+        timeout: float = 30.0,
+        delay: float = 0.1,
+    ) -> None:
+        """Record stop service events."""
+        super().stop_services(services, timeout, delay)
+        self.container_calls.add_stop(self.container_name, services)
+
+
+class _OSTestingModelBackend(_TestingModelBackend):
+    """Testing model backend which hands out recording pebble clients."""
+
+    container_calls: ContainerCalls = None
+
+    def get_pebble(self, socket_path: str) -> _OSTestingPebbleClient:
+        """Get the testing pebble client."""
+        client = self._pebble_clients.get(socket_path, None)
+        if client is None:
+            client = _OSTestingPebbleClient(self)
+            # Extract container name from:
+            # /charm/containers/placement-api/pebble.socket
+            client.container_name = socket_path.split("/")[3]
+            client.container_calls = self.container_calls
+            self._pebble_clients[socket_path] = client
+        self._pebble_clients_can_connect[client] = not SIMULATE_CAN_CONNECT
+        return client
+
+    def network_get(self, endpoint_name: str, relation_id: str = None) -> dict:
+        """Return a fake set of network data."""
+        return _NETWORK_DATA
+
+
 def get_harness(
     charm_class: ops.charm.CharmBase,
     charm_metadata: str = None,
@@ -604,100 +777,20 @@ def get_harness(
     initial_charm_config: dict = None,
 ) -> Harness:
     """Return a testing harness."""
-
-    class _OSTestingPebbleClient(_TestingPebbleClient):
-        def exec(
-            self,
-            command: typing.List[str],
-            *,
-            environment: typing.Dict[str, str] = None,
-            working_dir: str = None,
-            timeout: float = None,
-            user_id: int = None,
-            user: str = None,
-            group_id: int = None,
-            group: str = None,
-            stdin: typing.Union[
-                str, bytes, typing.TextIO, typing.BinaryIO
-            ] = None,
-            stdout: typing.Union[typing.TextIO, typing.BinaryIO] = None,
-            stderr: typing.Union[typing.TextIO, typing.BinaryIO] = None,
-            encoding: str = "utf-8",
-            combine_stderr: bool = False,
-        ) -> None:
-            container_calls.add_execute(self.container_name, command)
-            process_mock = MagicMock()
-            process_mock.wait_output.return_value = ("", None)
-            return process_mock
-
-        def start_services(
-            self,
-            services: List[str],
-            timeout: float = 30.0,
-            delay: float = 0.1,
-        ) -> None:
-            """Record start service events."""
-            super().start_services(services, timeout, delay)
-            container_calls.add_start(self.container_name, services)
-
-        def stop_services(
-            self,
-            services: List[str],
-            timeout: float = 30.0,
-            delay: float = 0.1,
-        ) -> None:
-            """Record stop service events."""
-            super().stop_services(services, timeout, delay)
-            container_calls.add_stop(self.container_name, services)
-
-    class _OSTestingModelBackend(_TestingModelBackend):
-        def get_pebble(self, socket_path: str) -> _OSTestingPebbleClient:
-            """Get the testing pebble client."""
-            client = self._pebble_clients.get(socket_path, None)
-            if client is None:
-                client = _OSTestingPebbleClient(self)
-                # Extract container name from:
-                # /charm/containers/placement-api/pebble.socket
-                client.container_name = socket_path.split("/")[3]
-                self._pebble_clients[socket_path] = client
-            self._pebble_clients_can_connect[client] = not SIMULATE_CAN_CONNECT
-            return client
-
-        def network_get(
-            self, endpoint_name: str, relation_id: str = None
-        ) -> dict:
-            """Return a fake set of network data."""
-            network_data = {
-                "bind-addresses": [
-                    {
-                        "interface-name": "eth0",
-                        "addresses": [
-                            {"cidr": "10.0.0.0/24", "value": "10.0.0.10"}
-                        ],
-                    }
-                ],
-                "ingress-addresses": ["10.0.0.10"],
-                "egress-subnets": ["10.0.0.0/24"],
-            }
-            return network_data
-
-    filename = inspect.getfile(charm_class)
-    # Use pathlib.Path(filename).parents[1] if tests structure is
-    # <charm>/unit_tests
-    # Use pathlib.Path(filename).parents[2] if tests structure is
-    # <charm>/tests/unit/
-    charm_dir = pathlib.Path(filename).parents[2]
+    charm_dir = _charm_dir(charm_class)
 
     if not charm_metadata:
-        metadata_file = f"{charm_dir}/metadata.yaml"
-        if os.path.isfile(metadata_file):
-            with open(metadata_file) as f:
-                charm_metadata = f.read()
+        charm_metadata = _read_charm_file(f"{charm_dir}/metadata.yaml")
 
     harness = Harness(charm_class, meta=charm_metadata, config=charm_config)
     harness._backend = _OSTestingModelBackend(
-        harness._unit_name, harness._meta, harness._get_config(charm_config)
+        harness._unit_name,
+        harness._meta,
+        _load_charm_config(charm_config)
+        if charm_config
+        else harness._get_config(charm_config),
     )
+    harness._backend.container_calls = container_calls
     harness._model = model.Model(harness._meta, harness._backend)
     harness._framework = framework.Framework(
         ":memory:", harness._charm_dir, harness._meta, harness._model
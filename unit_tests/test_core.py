@@ -73,6 +73,15 @@ class TestOSBaseOperatorCharm(test_utils.CharmTestCase):
         """Test relation handlers are ready."""
         self.assertTrue(self.harness.charm.relation_handlers_ready())
 
+    def test_get_sans_skips_missing_addresses(self) -> None:
+        """Test bindings without an address are left out of the SANs."""
+        with mock.patch.object(
+            self.harness.charm,
+            "get_ip_sans",
+            return_value=["10.0.0.10", None, "10.0.0.10"],
+        ):
+            self.assertEqual(self.harness.charm.get_sans(), ["10.0.0.10"])
+
 
 class _TestOSBaseOperatorAPICharm(test_utils.CharmTestCase):
     """Test for the OSBaseOperatorAPICharm class."""
@@ -198,6 +207,20 @@ class TestOSBaseOperatorAPICharm(_TestOSBaseOperatorAPICharm):
             ["wsgi-my-service"],
         )
 
+    def test_config_change_restarts_wsgi(self) -> None:
+        """Test the wsgi service is restarted when its config changes."""
+        test_utils.add_complete_ingress_relation(self.harness)
+        self.harness.set_leader()
+        test_utils.add_complete_peer_relation(self.harness)
+        self.set_pebble_ready()
+        self.harness.charm.leader_set({"foo": "bar"})
+        test_utils.add_api_relations(self.harness)
+        test_utils.add_complete_cloud_credentials_relation(self.harness)
+        self.harness.set_can_connect("my-service", True)
+        with mock.patch.object(ops.model.Container, "restart") as restart:
+            self.harness.update_config({"debug": False})
+        restart.assert_called_once_with("wsgi-my-service")
+
     def test__on_database_changed(self) -> None:
         """Test database is requested."""
         rel_id = self.harness.add_relation("peers", "my-service")
@@ -225,6 +248,29 @@ class TestOSBaseOperatorAPICharm(_TestOSBaseOperatorAPICharm):
         self.assertEqual(contexts.database.database_password, "hardpassword")
         self.assertEqual(contexts.options.debug, True)
 
+    def test_contexts_database_removed(self) -> None:
+        """Test contexts after the database relation is removed."""
+        self.set_pebble_ready()
+        db_rel_id = test_utils.add_base_db_relation(self.harness)
+        test_utils.add_db_relation_credentials(self.harness, db_rel_id)
+        self.assertTrue(self.harness.charm.dbs["database"].ready)
+        self.harness.remove_relation(db_rel_id)
+        self.assertFalse(self.harness.charm.dbs["database"].ready)
+        contexts = self.harness.charm.contexts()
+        self.assertFalse(hasattr(contexts, "database"))
+
+    def test_peer_context_tracks_app_data(self) -> None:
+        """Test peer context reflects updates to the app data bag."""
+        rel_id = self.harness.add_relation("peers", "my-service")
+        self.harness.add_relation_unit(rel_id, "my-service/1")
+        self.harness.set_leader()
+        self.harness.charm.leader_set({"foo-key": "bar"})
+        self.assertEqual(self.harness.charm.peers.context()["foo_key"], "bar")
+        self.harness.update_relation_data(
+            rel_id, "my-service", {"foo-key": "baz"}
+        )
+        self.assertEqual(self.harness.charm.peers.context()["foo_key"], "baz")
+
     def test_peer_leader_db(self) -> None:
         """Test interacting with peer app db."""
         rel_id = self.harness.add_relation("peers", "my-service")
@@ -259,7 +305,7 @@ class TestOSBaseOperatorAPICharm(_TestOSBaseOperatorAPICharm):
         )
         self.assertEqual(self.harness.charm.public_url, "http://public-url")
 
-    @mock.patch("ops_sunbeam.charm.Client")
+    @mock.patch("lightkube.Client")
     def test_endpoint_urls_no_ingress(self, mock_client: mock.patch) -> None:
         """Test public_url and internal_url with no ingress defined."""
 
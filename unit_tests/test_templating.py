@@ -80,3 +80,48 @@ class TestTemplating(test_utils.CharmTestCase):
             container_mock, config, "/tmp/templates", {"debug": True}
         )
         self.assertFalse(container_mock.push.called)
+
+    @mock.patch("jinja2.FileSystemLoader")
+    def test_render_reuses_environment(
+        self, fs_loader: "jinja2.FileSystemLoader"
+    ) -> None:
+        """Check the Jinja environment is shared between renders."""
+        container_mock = mock.MagicMock()
+        config = sunbeam_core.ContainerConfigFile(
+            "/tmp/testfile.txt", "myuser", "mygrp"
+        )
+        fs_loader.return_value = jinja2.DictLoader(
+            {"testfile.txt": "debug = {{ debug }}"}
+        )
+        for debug in (True, False):
+            sunbeam_templating.sidecar_config_render(
+                container_mock, config, "/tmp/templates", {"debug": debug}
+            )
+        fs_loader.assert_called_once_with("/tmp/templates")
+        self.assertEqual(container_mock.push.call_count, 2)
+
+    @mock.patch("jinja2.FileSystemLoader")
+    def test_render_unchanged_digest(
+        self, fs_loader: "jinja2.FileSystemLoader"
+    ) -> None:
+        """Check unchanged contents are not pulled or pushed again."""
+        container_mock = mock.MagicMock()
+        container_mock.name = "mycontainer"
+        config = sunbeam_core.ContainerConfigFile(
+            "/tmp/testfile.txt", "myuser", "mygrp"
+        )
+        fs_loader.return_value = jinja2.DictLoader(
+            {"testfile.txt": "debug = {{ debug }}"}
+        )
+        digests = {}
+        for _ in range(2):
+            sunbeam_templating.sidecar_config_render(
+                container_mock,
+                config,
+                "/tmp/templates",
+                {"debug": True},
+                digests,
+            )
+        container_mock.pull.assert_called_once_with("/tmp/testfile.txt")
+        container_mock.push.assert_called_once()
+        self.assertIn(("mycontainer", "/tmp/testfile.txt"), digests)